@@ -170,6 +170,35 @@ async fn serve_role_page(path: web::Path<String>) -> HttpResponse {
     }
 }
 
+/// Serve service static page, or its JSON chunk for `/services/{name}.json`
+async fn serve_service_page(path: web::Path<String>) -> HttpResponse {
+    let service = path.into_inner();
+    let static_dir = std::env::var("STATIC_DIR")
+        .unwrap_or_else(|_| "../data/static".to_string());
+
+    // Convert service name to filename (replace / with _)
+    let (filename, content_type) = match service.strip_suffix(".json") {
+        Some(name) => (format!("{}.json", name.replace('/', "_")), "application/json"),
+        None => (format!("{}.html", service.replace('/', "_")), "text/html; charset=utf-8"),
+    };
+    let filepath = PathBuf::from(&static_dir).join("services").join(&filename);
+
+    match fs::read_to_string(&filepath) {
+        Ok(content) => HttpResponse::Ok()
+            .insert_header((header::CONTENT_TYPE, content_type))
+            .body(content),
+        Err(_) if content_type == "application/json" => HttpResponse::NotFound().json(json!({
+            "success": false,
+            "error": "Service not found"
+        })),
+        Err(_) => HttpResponse::NotFound()
+            .insert_header((header::CONTENT_TYPE, "text/html; charset=utf-8"))
+            .body(r#"<!DOCTYPE html>
+<html><head><title>Service Not Found</title></head>
+<body><h1>Service not found</h1><p><a href="/">Back to search</a></p></body></html>"#)
+    }
+}
+
 /// Serve sitemap.xml
 async fn serve_sitemap() -> HttpResponse {
     let static_dir = std::env::var("STATIC_DIR")
@@ -283,6 +312,7 @@ async fn main() -> std::io::Result<()> {
             // Static pages for SEO
             .route("/permissions/{name:.*}", web::get().to(serve_permission_page))
             .route("/roles/{name:.*}", web::get().to(serve_role_page))
+            .route("/services/{name:.*}", web::get().to(serve_service_page))
             .route("/sitemap.xml", web::get().to(serve_sitemap))
             // Catch all
             .default_service(web::route().to(not_found))
@@ -47,7 +47,6 @@ struct PrebuiltIndex {
     roles: Vec<Role>,
     role_names: Vec<String>,
     role_summaries: Vec<RoleSummary>,
-    #[allow(dead_code)]
     service_to_permissions: HashMap<String, Vec<u32>>,
     permission_names_lower: Vec<String>,
     role_names_lower: Vec<String>,
@@ -178,6 +177,7 @@ fn handle_request(req: Request) -> Result<Response, Error> {
         p if p.starts_with("/api/v1/search") => serve_json(handle_search(&req)),
         p if p.starts_with("/permissions/") => serve_permission_page(p),
         p if p.starts_with("/roles/") => serve_role_page(p),
+        p if p.starts_with("/services/") => serve_service_page(p),
         _ => serve_not_found(),
     }
 }
@@ -240,6 +240,17 @@ fn serve_sitemap() -> Result<Response, Error> {
         ));
     }
 
+    // Add service pages
+    let mut services: Vec<&String> = index_data.service_to_permissions.keys().collect();
+    services.sort();
+    for service in services {
+        let encoded = urlencoding::encode(service);
+        sitemap.push_str(&format!(
+            "  <url>\n    <loc>https://gcpiam.com/services/{}</loc>\n    <priority>0.8</priority>\n  </url>\n",
+            encoded
+        ));
+    }
+
     sitemap.push_str("</urlset>");
 
     let mut resp = Response::from_status(StatusCode::OK);
@@ -508,6 +519,119 @@ fn serve_role_page(path: &str) -> Result<Response, Error> {
     Ok(resp)
 }
 
+fn serve_service_page(path: &str) -> Result<Response, Error> {
+    let name = path.strip_prefix("/services/").unwrap_or("");
+    let (service, as_json) = match name.strip_suffix(".json") {
+        Some(service) => (service, true),
+        None => (name, false),
+    };
+    if service.is_empty() {
+        return serve_not_found();
+    }
+
+    let index: PrebuiltIndex = match bincode::deserialize(INDEX_DATA) {
+        Ok(idx) => idx,
+        Err(_) => return serve_not_found(),
+    };
+
+    let perm_indices = match index.service_to_permissions.get(service) {
+        Some(indices) => indices,
+        None => return serve_not_found(),
+    };
+    let perms: Vec<&Permission> = perm_indices.iter().map(|&i| &index.permissions[i as usize]).collect();
+
+    if as_json {
+        // Same layout as data/static/services/{service}.json:
+        // [name, resource, action, [role indexes]] per permission
+        let chunk: Vec<(&str, &str, &str, &[u32])> = perms
+            .iter()
+            .map(|p| (p.name.as_str(), p.resource.as_str(), p.action.as_str(), p.granted_by_roles.as_slice()))
+            .collect();
+        let mut resp = Response::from_status(StatusCode::OK);
+        resp.set_header("Content-Type", "application/json");
+        resp.set_header("Access-Control-Allow-Origin", "https://gcpiam.com");
+        resp.set_header("Cache-Control", "public, max-age=3600");
+        resp.set_body(serde_json::to_string(&chunk).unwrap());
+        return Ok(resp);
+    }
+
+    // Generate permissions list
+    let perms_html: String = perms
+        .iter()
+        .map(|perm| {
+            format!(
+                r#"<div class="perm-item"><a href="/permissions/{}" class="perm-name">{}</a></div>"#,
+                html_escape(&perm.name),
+                html_escape(&perm.name)
+            )
+        })
+        .collect::<Vec<_>>()
+        .join("\n");
+
+    let html = format!(r#"<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{} permissions - GCP IAM Service</title>
+    <meta name="description" content="All {} GCP IAM permissions of the {} service.">
+    <style>
+        :root {{ --accent: #1f73e7; }}
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: system-ui, sans-serif; background: #f5f5f5; color: #333; line-height: 1.6; }}
+        .container {{ max-width: 900px; margin: 0 auto; padding: 20px; }}
+        .header {{ background: linear-gradient(135deg, var(--accent), #1557b0); color: white; padding: 30px 20px; margin: -20px -20px 20px; }}
+        .breadcrumb {{ margin-bottom: 10px; opacity: 0.9; }}
+        .breadcrumb a {{ color: white; text-decoration: none; }}
+        .breadcrumb a:hover {{ text-decoration: underline; }}
+        h1 {{ font-size: 1.5rem; word-break: break-all; }}
+        .meta {{ display: flex; gap: 10px; margin-top: 15px; flex-wrap: wrap; }}
+        .badge {{ padding: 4px 12px; border-radius: 4px; font-size: 0.85rem; }}
+        .section {{ background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
+        .section-title {{ font-size: 1.1rem; margin-bottom: 15px; color: #555; }}
+        .perm-item {{ padding: 8px 12px; border-bottom: 1px solid #eee; }}
+        .perm-item:last-child {{ border-bottom: none; }}
+        .perm-name {{ color: var(--accent); text-decoration: none; font-family: monospace; font-size: 0.9rem; }}
+        .perm-name:hover {{ text-decoration: underline; }}
+        @media (prefers-color-scheme: dark) {{
+            body {{ background: #1a1a1a; color: #e0e0e0; }}
+            .section {{ background: #2d2d2d; }}
+            .perm-item {{ border-color: #444; }}
+            .section-title {{ color: #aaa; }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="breadcrumb"><a href="/">Search</a> / Service</div>
+            <h1>{}</h1>
+            <div class="meta">
+                <span class="badge" style="background:rgba(255,255,255,0.2);">{} permissions</span>
+            </div>
+        </div>
+        <div class="section">
+            <div class="section-title">Permissions</div>
+            {}
+        </div>
+    </div>
+</body>
+</html>"#,
+        html_escape(service),
+        perms.len(),
+        html_escape(service),
+        html_escape(service),
+        perms.len(),
+        perms_html
+    );
+
+    let mut resp = Response::from_status(StatusCode::OK);
+    resp.set_header("Content-Type", "text/html; charset=utf-8");
+    resp.set_header("Cache-Control", "public, max-age=3600");
+    resp.set_body(html);
+    Ok(resp)
+}
+
 fn html_escape(s: &str) -> String {
     s.replace('&', "&amp;")
         .replace('<', "&lt;")
@@ -8,21 +8,60 @@ Fetches all GCP IAM roles and permissions, generates:
 - sitemap.xml for SEO
 """
 
+import argparse
+import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
+import http.client
+import io
 import json
+import multiprocessing
+import re
+import string
 import subprocess
 import sys
 import os
-from datetime import datetime
+import tarfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from datetime import datetime, timezone
 from pathlib import Path
-from html import escape
 from urllib.parse import quote
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 BASE_URL = "https://gcpiam.com"
 OUTPUT_DIR = Path(__file__).parent.parent / "data"
 STATIC_DIR = OUTPUT_DIR / "static"
 ROLES_DIR = STATIC_DIR / "roles"
 PERMISSIONS_DIR = STATIC_DIR / "permissions"
+SERVICES_DIR = STATIC_DIR / "services"
+PAGES_ARCHIVE = STATIC_DIR / "pages.tar.gz"
+PAGES_MANIFEST = STATIC_DIR / ".manifest.json"
+IAM_API_HOST = "iam.googleapis.com"
+ROLES_PATH = "/v1/roles?pageSize=1000&view=FULL"
+
+# Matches the top-level nextPageToken in a raw list response; quotes inside
+# role strings are escaped, so this cannot match within a description.
+_NEXT_PAGE_TOKEN_RE = re.compile(rb'"nextPageToken":\s*"((?:[^"\\]|\\.)*)"')
+
+# Same replacements as html.escape(quote=True), applied in a single pass.
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
 
 
 def get_token():
@@ -34,40 +73,94 @@ def get_token():
     return result.stdout.strip()
 
 
-def fetch_url(url, token, method='GET', data=None):
-    """Fetch URL with authentication."""
-    import urllib.request
-
-    req = urllib.request.Request(url, method=method)
-    req.add_header('Authorization', f'Bearer {token}')
-    if data:
-        req.add_header('Content-Type', 'application/json')
-        req.data = json.dumps(data).encode()
-
-    with urllib.request.urlopen(req) as response:
-        return json.loads(response.read().decode())
-
-
-def fetch_all_roles(token):
-    """Fetch all predefined roles from GCP IAM API."""
+def load_json(data):
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj, indent=True):
+    """Encode obj as UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+# Raised when the server has dropped an idle keep-alive connection
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest)
+
+
+def fetch_page(conn, path, token):
+    """Fetch a path over a persistent HTTPS connection, returning the raw body.
+
+    If the server has closed the connection, it is reopened and the request
+    retried once.
+    """
+    headers = {'Authorization': f'Bearer {token}'}
+    try:
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+    except _STALE_CONNECTION_ERRORS:
+        conn.close()
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+    body = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"GET {path} failed: HTTP {response.status} {response.reason}")
+    return body
+
+
+async def fetch_all_roles(token):
+    """Fetch all predefined roles from GCP IAM API.
+
+    Pagination is serial, so a producer issues the next request as soon as the
+    nextPageToken is found in the raw body while the previous page is decoded.
+    The consumer checks that token against the decoded page, so a regex miss
+    cannot silently truncate or misdirect the listing.
+    """
+    conn = http.client.HTTPSConnection(IAM_API_HOST, timeout=60)
+    pages = asyncio.Queue(maxsize=2)
+
+    async def produce():
+        page_token = None
+        try:
+            while True:
+                path = ROLES_PATH
+                if page_token:
+                    path += f"&pageToken={quote(page_token, safe='')}"
+                body = await asyncio.to_thread(fetch_page, conn, path, token)
+                match = _NEXT_PAGE_TOKEN_RE.search(body)
+                # The match is raw JSON string content; decode escapes such as \u003d
+                page_token = load_json(b'"' + match.group(1) + b'"') if match else None
+                await pages.put((body, page_token))
+                if not page_token:
+                    break
+        finally:
+            await pages.put(None)
+
+    producer = asyncio.create_task(produce())
     all_roles = []
-    page_token = None
     page_num = 0
-
-    while True:
-        page_num += 1
-        url = "https://iam.googleapis.com/v1/roles?pageSize=1000&view=FULL"
-        if page_token:
-            url += f"&pageToken={page_token}"
-
-        data = fetch_url(url, token)
-        roles = data.get('roles', [])
-        all_roles.extend(roles)
-        print(f"  Fetched page {page_num}: {len(roles)} roles (total: {len(all_roles)})", file=sys.stderr)
-
-        page_token = data.get('nextPageToken')
-        if not page_token:
-            break
+    try:
+        while (page := await pages.get()) is not None:
+            body, page_token = page
+            page_num += 1
+            data = await asyncio.to_thread(load_json, body)
+            if (data.get('nextPageToken') or None) != (page_token or None):
+                raise RuntimeError(
+                    f"Page {page_num}: nextPageToken {data.get('nextPageToken')!r} "
+                    f"does not match the token scanned from the raw body {page_token!r}"
+                )
+            roles = data.get('roles', [])
+            all_roles.extend(roles)
+            print(f"  Fetched page {page_num}: {len(roles)} roles (total: {len(all_roles)})", file=sys.stderr)
+        await producer
+    finally:
+        producer.cancel()
+        conn.close()
 
     return all_roles
 
@@ -81,45 +174,47 @@ def fetch_permission_metadata(token, permissions_batch):
 
 def build_dataset(roles):
     """Build the complete dataset with bidirectional references."""
-    # Build permission -> roles mapping
-    permission_to_roles = {}
-    all_permissions = set()
+    # Build roles data and the permission -> role id mapping in one pass over
+    # the roles. Each role's summary is built once and shared by every
+    # permission it grants.
+    roles_data = []
+    role_summaries = []
+    permission_to_role_ids = defaultdict(list)
 
-    for role in roles:
+    for role_id, role in enumerate(roles):
         role_name = role.get('name', '')
+        title = role.get('title', '')
+        stage = role.get('stage', 'GA')
         perms = role.get('includedPermissions', [])
-        for perm in perms:
-            all_permissions.add(perm)
-            if perm not in permission_to_roles:
-                permission_to_roles[perm] = []
-            permission_to_roles[perm].append({
-                'name': role_name,
-                'title': role.get('title', ''),
-                'stage': role.get('stage', 'GA'),
-            })
-
-    # Build roles data
-    roles_data = []
-    for role in roles:
         roles_data.append({
-            'name': role.get('name', ''),
-            'title': role.get('title', ''),
+            'name': role_name,
+            'title': title,
             'description': role.get('description', ''),
-            'stage': role.get('stage', 'GA'),
-            'included_permissions': role.get('includedPermissions', []),
+            'stage': stage,
+            'included_permissions': perms,
             'etag': role.get('etag', ''),
         })
+        role_summaries.append({
+            'name': role_name,
+            'title': title,
+            'stage': stage,
+        })
+        for perm in perms:
+            permission_to_role_ids[perm].append(role_id)
 
     # Build permissions data with roles that grant them
     permissions_data = []
-    for perm in sorted(all_permissions):
-        parts = perm.split('.')
+    for perm, role_ids in sorted(permission_to_role_ids.items()):
+        # service.resource.action; extra segments are dropped
+        service, _, rest = perm.partition('.')
+        resource, _, rest = rest.partition('.')
+        action = rest.partition('.')[0]
         permissions_data.append({
             'name': perm,
-            'service': parts[0] if parts else '',
-            'resource': parts[1] if len(parts) > 1 else '',
-            'action': parts[2] if len(parts) > 2 else '',
-            'granted_by_roles': permission_to_roles.get(perm, []),
+            'service': service,
+            'resource': resource,
+            'action': action,
+            'granted_by_roles': [role_summaries[i] for i in role_ids],
         })
 
     return {
@@ -128,47 +223,103 @@ def build_dataset(roles):
         'metadata': {
             'total_roles': len(roles_data),
             'total_permissions': len(permissions_data),
-            'last_updated': datetime.utcnow().isoformat() + 'Z',
+            'last_updated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
             'source': 'Google Cloud IAM API',
         }
     }
 
 
-def generate_html_head(title, description, canonical_path):
-    """Generate HTML head section with SEO meta tags."""
-    return f'''<!DOCTYPE html>
+def build_compact_dataset(dataset):
+    """Build the string-pooled form of the dataset written to iam-data.min.json.
+
+    Every string is stored once in 'pool' and referenced by index:
+
+        roles:       [name, title, description, stage, etag, [permission indexes]]
+        permissions: [name, service, resource, action, [role indexes]]
+
+    Role and permission indexes point into the 'roles' and 'permissions'
+    arrays of the same document.
+    """
+    pool = []
+    pool_ids = {}
+
+    def intern(value):
+        string_id = pool_ids.get(value)
+        if string_id is None:
+            string_id = pool_ids[value] = len(pool)
+            pool.append(value)
+        return string_id
+
+    role_ids = {role['name']: i for i, role in enumerate(dataset['roles'])}
+    perm_ids = {perm['name']: i for i, perm in enumerate(dataset['permissions'])}
+
+    roles = [
+        [
+            intern(role['name']),
+            intern(role['title']),
+            intern(role['description']),
+            intern(role['stage']),
+            intern(role['etag']),
+            [perm_ids[perm] for perm in role['included_permissions']],
+        ]
+        for role in dataset['roles']
+    ]
+    permissions = [
+        [
+            intern(perm['name']),
+            intern(perm['service']),
+            intern(perm['resource']),
+            intern(perm['action']),
+            [role_ids[role['name']] for role in perm['granted_by_roles']],
+        ]
+        for perm in dataset['permissions']
+    ]
+
+    return {
+        'pool': pool,
+        'roles': roles,
+        'permissions': permissions,
+        'metadata': dataset['metadata'],
+    }
+
+
+# Per-page <head> fields; everything else in the head is identical across pages.
+_HEAD_TMPL = string.Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{escape(title)} | GCP IAM Reference</title>
-    <meta name="description" content="{escape(description)}">
-    <link rel="canonical" href="{BASE_URL}{canonical_path}">
-    <meta property="og:title" content="{escape(title)}">
-    <meta property="og:description" content="{escape(description)}">
-    <meta property="og:url" content="{BASE_URL}{canonical_path}">
+    <title>$title | GCP IAM Reference</title>
+    <meta name="description" content="$description">
+    <link rel="canonical" href="$url">
+    <meta property="og:title" content="$title">
+    <meta property="og:description" content="$description">
+    <meta property="og:url" content="$url">
     <meta property="og:type" content="website">
-    <style>
-        :root {{
+''')
+
+# Static stylesheet and body opening shared by every page.
+_HEAD_STYLE = '''    <style>
+        :root {
             --bg-primary: #ffffff;
             --bg-secondary: #f5f5f5;
             --text-primary: #1a1a1a;
             --text-secondary: #666666;
             --border-color: #e0e0e0;
             --accent: #1a73e8;
-        }}
-        @media (prefers-color-scheme: dark) {{
-            :root {{
+        }
+        @media (prefers-color-scheme: dark) {
+            :root {
                 --bg-primary: #1a1a1a;
                 --bg-secondary: #2d2d2d;
                 --text-primary: #e0e0e0;
                 --text-secondary: #b0b0b0;
                 --border-color: #404040;
                 --accent: #8ab4f8;
-            }}
-        }}
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
+            }
+        }
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: var(--bg-primary);
             color: var(--text-primary);
@@ -176,31 +327,31 @@ def generate_html_head(title, description, canonical_path):
             padding: 2rem;
             max-width: 1000px;
             margin: 0 auto;
-        }}
-        h1 {{ color: var(--accent); margin-bottom: 0.5rem; word-break: break-word; }}
-        h2 {{ margin-top: 2rem; margin-bottom: 1rem; border-bottom: 2px solid var(--border-color); padding-bottom: 0.5rem; }}
-        .subtitle {{ color: var(--text-secondary); margin-bottom: 1rem; }}
-        .description {{ background: var(--bg-secondary); padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; }}
-        .badge {{ display: inline-block; padding: 2px 8px; border-radius: 4px; font-size: 0.85rem; margin-right: 0.5rem; }}
-        .badge-ga {{ background: #e8f5e9; color: #2e7d32; }}
-        .badge-beta {{ background: #fff3e0; color: #e65100; }}
-        .badge-alpha {{ background: #e3f2fd; color: #1565c0; }}
-        .badge-deprecated {{ background: #ffebee; color: #c62828; }}
-        .list {{ list-style: none; }}
-        .list li {{ padding: 0.75rem 1rem; border-bottom: 1px solid var(--border-color); }}
-        .list li:hover {{ background: var(--bg-secondary); }}
-        .list a {{ color: var(--accent); text-decoration: none; }}
-        .list a:hover {{ text-decoration: underline; }}
-        .role-title {{ color: var(--text-secondary); font-size: 0.9rem; }}
-        .count {{ color: var(--text-secondary); font-size: 0.9rem; }}
-        .back-link {{ display: inline-block; margin-bottom: 1rem; color: var(--accent); text-decoration: none; }}
-        .back-link:hover {{ text-decoration: underline; }}
-        @media (prefers-color-scheme: dark) {{
-            .badge-ga {{ background: #1b3d20; color: #81c784; }}
-            .badge-beta {{ background: #3d2f1f; color: #ffb74d; }}
-            .badge-alpha {{ background: #1e3a5f; color: #90caf9; }}
-            .badge-deprecated {{ background: #3d1f1f; color: #ef9a9a; }}
-        }}
+        }
+        h1 { color: var(--accent); margin-bottom: 0.5rem; word-break: break-word; }
+        h2 { margin-top: 2rem; margin-bottom: 1rem; border-bottom: 2px solid var(--border-color); padding-bottom: 0.5rem; }
+        .subtitle { color: var(--text-secondary); margin-bottom: 1rem; }
+        .description { background: var(--bg-secondary); padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; }
+        .badge { display: inline-block; padding: 2px 8px; border-radius: 4px; font-size: 0.85rem; margin-right: 0.5rem; }
+        .badge-ga { background: #e8f5e9; color: #2e7d32; }
+        .badge-beta { background: #fff3e0; color: #e65100; }
+        .badge-alpha { background: #e3f2fd; color: #1565c0; }
+        .badge-deprecated { background: #ffebee; color: #c62828; }
+        .list { list-style: none; }
+        .list li { padding: 0.75rem 1rem; border-bottom: 1px solid var(--border-color); }
+        .list li:hover { background: var(--bg-secondary); }
+        .list a { color: var(--accent); text-decoration: none; }
+        .list a:hover { text-decoration: underline; }
+        .role-title { color: var(--text-secondary); font-size: 0.9rem; }
+        .count { color: var(--text-secondary); font-size: 0.9rem; }
+        .back-link { display: inline-block; margin-bottom: 1rem; color: var(--accent); text-decoration: none; }
+        .back-link:hover { text-decoration: underline; }
+        @media (prefers-color-scheme: dark) {
+            .badge-ga { background: #1b3d20; color: #81c784; }
+            .badge-beta { background: #3d2f1f; color: #ffb74d; }
+            .badge-alpha { background: #1e3a5f; color: #90caf9; }
+            .badge-deprecated { background: #3d1f1f; color: #ef9a9a; }
+        }
     </style>
 </head>
 <body>
@@ -208,6 +359,21 @@ def generate_html_head(title, description, canonical_path):
 '''
 
 
+@functools.lru_cache(maxsize=20000)
+def esc(s):
+    """HTML-escape a string; role names and titles repeat across many pages."""
+    return s.translate(_HTML_ESCAPE)
+
+
+def generate_html_head(title, description, canonical_path):
+    """Generate HTML head section with SEO meta tags."""
+    return _HEAD_TMPL.substitute(
+        title=esc(title),
+        description=esc(description),
+        url=BASE_URL + canonical_path,
+    ) + _HEAD_STYLE
+
+
 def generate_html_footer():
     """Generate HTML footer."""
     return '''
@@ -223,11 +389,71 @@ def get_stage_badge(stage):
     """Get HTML badge for stage."""
     stage_lower = stage.lower() if stage else 'ga'
     badge_class = f'badge-{stage_lower}' if stage_lower in ['ga', 'beta', 'alpha', 'deprecated'] else 'badge-ga'
-    return f'<span class="badge {badge_class}">{escape(stage or "GA")}</span>'
+    return f'<span class="badge {badge_class}">{esc(stage or "GA")}</span>'
+
+
+def quote_names(dataset):
+    """URL-quote every permission name, role path and service once, keyed by name."""
+    quoted_perms = {p['name']: quote(p['name']) for p in dataset['permissions']}
+    quoted_role_paths = {r['name']: quote(r['name'].replace('roles/', '')) for r in dataset['roles']}
+    quoted_services = {p['service']: quote(p['service']) for p in dataset['permissions']}
+    return quoted_perms, quoted_role_paths, quoted_services
+
+
+# Per-thread list reused as the fragment buffer for every page a worker renders
+_scratch = threading.local()
+
+
+def _page_buffer():
+    """Return this thread's cleared page fragment buffer."""
+    parts = getattr(_scratch, 'parts', None)
+    if parts is None:
+        parts = _scratch.parts = []
+    parts.clear()
+    return parts
+
+
+def _finish_page(parts):
+    """Join and encode the buffered page, then release the fragments."""
+    html = ''.join(parts).encode('utf-8')
+    parts.clear()
+    return html
+
+
+def build_role_items(roles, quoted_role_paths):
+    """Pre-render the <li> linking to each role, keyed by role name."""
+    items = {}
+    for role in roles:
+        items[role['name']] = f'''    <li>
+        <a href="/roles/{quoted_role_paths[role['name']]}">{esc(role['name'])}</a>
+        {get_stage_badge(role.get('stage', 'GA'))}
+        <span class="role-title">{esc(role.get('title', ''))}</span>
+    </li>\n'''
+    return items
 
 
-def generate_permission_page(perm_data):
-    """Generate static HTML page for a permission."""
+def build_role_lists(permissions, role_items):
+    """Render the granting-roles <ul> once per distinct role set, keyed by permission name.
+
+    Many permissions are granted by exactly the same roles, so permissions
+    sharing a role set share one rendered block.
+    """
+    blocks = {}
+    role_lists = {}
+    for perm in permissions:
+        roles = perm.get('granted_by_roles', [])
+        if not roles:
+            continue
+        group = tuple(sorted(role['name'] for role in roles))
+        block = blocks.get(group)
+        if block is None:
+            block = blocks[group] = '<ul class="list">\n' + ''.join(role_items[name] for name in group) + '</ul>\n'
+        role_lists[perm['name']] = block
+    return role_lists
+
+
+def generate_permission_page(perm_data, role_lists, quoted_perms):
+    """Generate static HTML page for a permission, as UTF-8 bytes."""
     name = perm_data['name']
     service = perm_data['service']
     resource = perm_data['resource']
@@ -237,40 +463,33 @@ def generate_permission_page(perm_data):
     title = name
     description = f"GCP IAM permission {name} - granted by {len(roles)} roles. Service: {service}, Resource: {resource}, Action: {action}."
 
-    html = generate_html_head(title, description, f"/permissions/{quote(name)}")
+    parts = _page_buffer()
+    parts.append(generate_html_head(title, description, f"/permissions/{quoted_perms[name]}"))
 
-    html += f'''
-    <h1>{escape(name)}</h1>
+    parts.append(f'''
+    <h1>{esc(name)}</h1>
     <p class="subtitle">GCP IAM Permission</p>
 
     <div class="description">
-        <p><strong>Service:</strong> {escape(service)}</p>
-        <p><strong>Resource:</strong> {escape(resource)}</p>
-        <p><strong>Action:</strong> {escape(action)}</p>
+        <p><strong>Service:</strong> {esc(service)}</p>
+        <p><strong>Resource:</strong> {esc(resource)}</p>
+        <p><strong>Action:</strong> {esc(action)}</p>
     </div>
 
     <h2>Roles that grant this permission <span class="count">({len(roles)})</span></h2>
-'''
+''')
 
     if roles:
-        html += '<ul class="list">\n'
-        for role in sorted(roles, key=lambda r: r['name']):
-            role_path = role['name'].replace('roles/', '')
-            html += f'''    <li>
-        <a href="/roles/{quote(role_path)}">{escape(role['name'])}</a>
-        {get_stage_badge(role.get('stage', 'GA'))}
-        <span class="role-title">{escape(role.get('title', ''))}</span>
-    </li>\n'''
-        html += '</ul>\n'
+        parts.append(role_lists[name])
     else:
-        html += '<p style="color: var(--text-secondary);">No predefined roles grant this permission directly.</p>\n'
+        parts.append('<p style="color: var(--text-secondary);">No predefined roles grant this permission directly.</p>\n')
 
-    html += generate_html_footer()
-    return html
+    parts.append(generate_html_footer())
+    return _finish_page(parts)
 
 
-def generate_role_page(role_data, permission_to_roles):
-    """Generate static HTML page for a role."""
+def generate_role_page(role_data, quoted_perms, quoted_role_paths):
+    """Generate static HTML page for a role, as UTF-8 bytes."""
     name = role_data['name']
     title = role_data.get('title', '')
     description = role_data.get('description', '')
@@ -279,73 +498,205 @@ def generate_role_page(role_data, permission_to_roles):
 
     meta_description = f"{title} - {description[:150]}..." if len(description) > 150 else f"{title} - {description}"
 
-    role_path = name.replace('roles/', '')
-    html = generate_html_head(f"{title} ({name})", meta_description, f"/roles/{quote(role_path)}")
+    parts = _page_buffer()
+    parts.append(generate_html_head(f"{title} ({name})", meta_description, f"/roles/{quoted_role_paths[name]}"))
 
-    html += f'''
-    <h1>{escape(name)}</h1>
-    <p class="subtitle">{escape(title)} {get_stage_badge(stage)}</p>
+    parts.append(f'''
+    <h1>{esc(name)}</h1>
+    <p class="subtitle">{esc(title)} {get_stage_badge(stage)}</p>
 
     <div class="description">
-        <p>{escape(description)}</p>
+        <p>{esc(description)}</p>
     </div>
 
     <h2>Included Permissions <span class="count">({len(permissions)})</span></h2>
-'''
+''')
 
     if permissions:
-        html += '<ul class="list">\n'
-        for perm in sorted(permissions):
-            html += f'    <li><a href="/permissions/{quote(perm)}">{escape(perm)}</a></li>\n'
-        html += '</ul>\n'
+        parts.append('<ul class="list">\n')
+        parts.extend(f'    <li><a href="/permissions/{quoted_perms[perm]}">{esc(perm)}</a></li>\n' for perm in sorted(permissions))
+        parts.append('</ul>\n')
     else:
-        html += '<p style="color: var(--text-secondary);">This role has no permissions.</p>\n'
+        parts.append('<p style="color: var(--text-secondary);">This role has no permissions.</p>\n')
 
-    html += generate_html_footer()
-    return html
+    parts.append(generate_html_footer())
+    return _finish_page(parts)
 
 
-def generate_sitemap(roles, permissions):
-    """Generate sitemap.xml."""
-    now = datetime.utcnow().strftime('%Y-%m-%d')
+def build_service_chunk(permissions, role_ids):
+    """Build the compact JSON chunk for one service's permissions.
 
-    xml = '''<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-    <url>
-        <loc>{base}/</loc>
-        <lastmod>{date}</lastmod>
-        <changefreq>daily</changefreq>
-        <priority>1.0</priority>
-    </url>
-'''.format(base=BASE_URL, date=now)
+    Each permission is [name, resource, action, [role indexes]], where the
+    role indexes point into the 'roles' array of iam-data.min.json.
+    """
+    return [
+        [perm['name'], perm['resource'], perm['action'], [role_ids[role['name']] for role in perm['granted_by_roles']]]
+        for perm in permissions
+    ]
 
-    # Add role pages
-    for role in roles:
-        role_path = role['name'].replace('roles/', '')
-        xml += f'''    <url>
-        <loc>{BASE_URL}/roles/{quote(role_path)}</loc>
-        <lastmod>{now}</lastmod>
-        <changefreq>weekly</changefreq>
-        <priority>0.8</priority>
+
+def group_by_service(permissions):
+    """Group permissions by service, returning a list of (service, permissions).
+
+    Permissions keep their name order within each service.
+    """
+    by_service = sorted(permissions, key=itemgetter('service'))
+    return [(service, list(group)) for service, group in groupby(by_service, key=itemgetter('service'))]
+
+
+def generate_service_page(service, permissions, quoted_perms, quoted_services):
+    """Generate static HTML page listing a service's permissions, as UTF-8 bytes."""
+    description = f"All {len(permissions)} GCP IAM permissions of the {service} service."
+
+    parts = _page_buffer()
+    parts.append(generate_html_head(f"{service} permissions", description, f"/services/{quoted_services[service]}"))
+
+    parts.append(f'''
+    <h1>{esc(service)}</h1>
+    <p class="subtitle">GCP IAM Service</p>
+
+    <h2>Permissions <span class="count">({len(permissions)})</span></h2>
+<ul class="list">
+''')
+    parts.extend(
+        f'    <li><a href="/permissions/{quoted_perms[perm["name"]]}">{esc(perm["name"])}</a></li>\n'
+        for perm in permissions
+    )
+    parts.append('</ul>\n')
+
+    parts.append(generate_html_footer())
+    return _finish_page(parts)
+
+
+# Lookups shared with page-rendering workers, set once per process by _init_worker
+_worker = {}
+
+
+def _init_worker(state):
+    """Share the pre-rendered role items and lookups with a page-rendering worker."""
+    _worker.update(state)
+
+
+def _render_perm(perm):
+    """Render a permission page in a worker, returning (filename, html_bytes)."""
+    # Use URL-safe filename
+    filename = perm['name'].replace('/', '_') + '.html'
+    return filename, generate_permission_page(perm, _worker['role_lists'], _worker['quoted_perms'])
+
+
+def _render_role(role):
+    """Render a role page in a worker, returning (filename, html_bytes)."""
+    # Use URL-safe filename (remove roles/ prefix)
+    role_name = role['name'].replace('roles/', '')
+    filename = role_name.replace('/', '_') + '.html'
+    return filename, generate_role_page(role, _worker['quoted_perms'], _worker['quoted_role_paths'])
+
+
+def load_manifest(path):
+    """Load the page -> [content hash, size] manifest written by the previous run."""
+    try:
+        manifest = load_json(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        # Missing or unreadable (e.g. truncated by an interrupted run): rewrite every page
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(path, manifest):
+    """Atomically replace the manifest, so an interrupted run never leaves it half-written."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(dump_json(dict(sorted(manifest.items()))))
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, data, key, old_manifest, new_manifest):
+    """Write data to path unless the previous run wrote identical content.
+
+    Records the content hash and size under key in new_manifest and returns
+    True if the file was written. The manifest is only trusted while the file
+    on disk still has the recorded size, so pages edited or restored outside
+    this script are regenerated.
+    """
+    entry = [hashlib.blake2b(data, digest_size=16).hexdigest(), len(data)]
+    new_manifest[key] = entry
+    if old_manifest.get(key) == entry:
+        try:
+            if path.stat().st_size == len(data):
+                return False
+        except FileNotFoundError:
+            pass
+    path.write_bytes(data)
+    return True
+
+
+@contextlib.contextmanager
+def open_archive(path, mtime):
+    """Open a gzipped tar archive for writing.
+
+    The gzip header carries the given mtime and no file name, so the archive
+    bytes depend only on the members added and the order they are added in.
+    """
+    with open(path, 'wb') as raw, \
+            gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=mtime) as gz, \
+            tarfile.open(fileobj=gz, mode='w') as tar:
+        yield tar
+
+
+def add_to_archive(tar, arcname, data, mtime):
+    """Add an in-memory file to an open tar archive."""
+    info = tarfile.TarInfo(arcname)
+    info.size = len(data)
+    info.mtime = mtime
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(data))
+
+
+_SITEMAP_URL = '''    <url>
+        <loc>{loc}</loc>
+        <lastmod>{lastmod}</lastmod>
+        <changefreq>{changefreq}</changefreq>
+        <priority>{priority}</priority>
     </url>
 '''
 
+
+def generate_sitemap(out_fp, roles, permissions, services, quoted_perms, quoted_role_paths, quoted_services, lastmod):
+    """Write sitemap.xml to an open text file."""
+    out_fp.write('''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+''')
+    out_fp.write(_SITEMAP_URL.format(
+        loc=f'{BASE_URL}/', lastmod=lastmod, changefreq='daily', priority='1.0',
+    ))
+
+    # Add role pages; only the path varies per entry
+    role_url = _SITEMAP_URL.format(
+        loc=f'{BASE_URL}/roles/{{path}}', lastmod=lastmod, changefreq='weekly', priority='0.8',
+    )
+    out_fp.writelines(role_url.format(path=quoted_role_paths[role['name']]) for role in roles)
+
+    # Add service pages
+    service_url = _SITEMAP_URL.format(
+        loc=f'{BASE_URL}/services/{{path}}', lastmod=lastmod, changefreq='weekly', priority='0.8',
+    )
+    out_fp.writelines(service_url.format(path=quoted_services[service]) for service in services)
+
     # Add permission pages
-    for perm in permissions:
-        xml += f'''    <url>
-        <loc>{BASE_URL}/permissions/{quote(perm['name'])}</loc>
-        <lastmod>{now}</lastmod>
-        <changefreq>weekly</changefreq>
-        <priority>0.7</priority>
-    </url>
-'''
+    perm_url = _SITEMAP_URL.format(
+        loc=f'{BASE_URL}/permissions/{{path}}', lastmod=lastmod, changefreq='weekly', priority='0.7',
+    )
+    out_fp.writelines(perm_url.format(path=quoted_perms[perm['name']]) for perm in permissions)
 
-    xml += '</urlset>\n'
-    return xml
+    out_fp.write('</urlset>\n')
 
 
-def generate_index_page(metadata):
-    """Generate index page with stats."""
+def generate_index_page(metadata, service_groups, quoted_services):
+    """Generate index page with stats and links to each service."""
+    service_links = ''.join(
+        f'                <li><a href="/services/{quoted_services[service]}">{esc(service)}</a> '
+        f'<span class="count">({len(perms)})</span></li>\n'
+        for service, perms in service_groups
+    )
     html = generate_html_head(
         "GCP IAM Permissions & Roles Search",
         f"Search {metadata['total_permissions']} GCP IAM permissions across {metadata['total_roles']} roles. Find which roles grant specific permissions.",
@@ -368,6 +719,9 @@ def generate_index_page(metadata):
                 <li><a href="/roles/">Browse all roles</a></li>
                 <li><a href="/permissions/">Browse all permissions</a></li>
             </ul>
+            <h2>Services</h2>
+            <ul class="list">
+{service_links}            </ul>
         </noscript>
     </div>
 
@@ -377,15 +731,39 @@ def generate_index_page(metadata):
     return html
 
 
+def save_json_data(dataset, json_path, compact_path):
+    """Write iam-data.json and its string-pooled compact form."""
+    json_path.write_bytes(dump_json(dataset))
+    compact_path.write_bytes(dump_json(build_compact_dataset(dataset), indent=False))
+
+
+def write_sitemap(path, dataset, services, quoted_perms, quoted_role_paths, quoted_services):
+    """Write sitemap.xml, dated by the dataset's last_updated timestamp."""
+    with open(path, 'w') as f:
+        generate_sitemap(f, dataset['roles'], dataset['permissions'], services,
+                         quoted_perms, quoted_role_paths, quoted_services,
+                         dataset['metadata']['last_updated'][:10])
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the GCP IAM data file and static site.")
+    parser.add_argument('--archive', action='store_true',
+                        help=f"write role, permission and service pages into {PAGES_ARCHIVE.name} instead of loose "
+                             "files; index.html and sitemap.xml are still written next to it")
+    parser.add_argument('--full', action='store_true',
+                        help=f"rewrite every page, ignoring the {PAGES_MANIFEST.name} from the previous run")
+    args = parser.parse_args()
+
     print("GCP IAM Static Site Generator", file=sys.stderr)
     print("=" * 40, file=sys.stderr)
 
     # Create output directories
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     STATIC_DIR.mkdir(parents=True, exist_ok=True)
-    ROLES_DIR.mkdir(parents=True, exist_ok=True)
-    PERMISSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    if not args.archive:
+        ROLES_DIR.mkdir(parents=True, exist_ok=True)
+        PERMISSIONS_DIR.mkdir(parents=True, exist_ok=True)
+        SERVICES_DIR.mkdir(parents=True, exist_ok=True)
 
     # Get token
     print("\n1. Authenticating with GCP...", file=sys.stderr)
@@ -394,7 +772,7 @@ def main():
 
     # Fetch roles
     print("\n2. Fetching roles from GCP IAM API...", file=sys.stderr)
-    roles = fetch_all_roles(token)
+    roles = asyncio.run(fetch_all_roles(token))
     print(f"   Fetched {len(roles)} roles", file=sys.stderr)
 
     # Build dataset
@@ -403,57 +781,105 @@ def main():
     print(f"   {dataset['metadata']['total_roles']} roles", file=sys.stderr)
     print(f"   {dataset['metadata']['total_permissions']} permissions", file=sys.stderr)
 
-    # Save JSON data
-    print("\n4. Saving JSON data...", file=sys.stderr)
     json_path = OUTPUT_DIR / "iam-data.json"
-    with open(json_path, 'w') as f:
-        json.dump(dataset, f, indent=2)
-    print(f"   Saved to {json_path}", file=sys.stderr)
-
-    # Build permission->roles lookup for role pages
-    perm_to_roles = {p['name']: p['granted_by_roles'] for p in dataset['permissions']}
-
-    # Generate static pages
-    print("\n5. Generating static HTML pages...", file=sys.stderr)
-
-    # Permission pages
-    print("   Generating permission pages...", file=sys.stderr)
-    for i, perm in enumerate(dataset['permissions']):
-        html = generate_permission_page(perm)
-        # Use URL-safe filename
-        filename = perm['name'].replace('/', '_') + '.html'
-        filepath = PERMISSIONS_DIR / filename
-        with open(filepath, 'w') as f:
-            f.write(html)
-        if (i + 1) % 1000 == 0:
-            print(f"      {i + 1}/{len(dataset['permissions'])} permissions", file=sys.stderr)
-    print(f"   Generated {len(dataset['permissions'])} permission pages", file=sys.stderr)
-
-    # Role pages
-    print("   Generating role pages...", file=sys.stderr)
-    for i, role in enumerate(dataset['roles']):
-        html = generate_role_page(role, perm_to_roles)
-        # Use URL-safe filename (remove roles/ prefix)
-        role_name = role['name'].replace('roles/', '')
-        filename = role_name.replace('/', '_') + '.html'
-        filepath = ROLES_DIR / filename
-        with open(filepath, 'w') as f:
-            f.write(html)
-        if (i + 1) % 500 == 0:
-            print(f"      {i + 1}/{len(dataset['roles'])} roles", file=sys.stderr)
-    print(f"   Generated {len(dataset['roles'])} role pages", file=sys.stderr)
-
-    # Generate sitemap
-    print("\n6. Generating sitemap.xml...", file=sys.stderr)
-    sitemap = generate_sitemap(dataset['roles'], dataset['permissions'])
+    compact_path = OUTPUT_DIR / "iam-data.min.json"
     sitemap_path = STATIC_DIR / "sitemap.xml"
-    with open(sitemap_path, 'w') as f:
-        f.write(sitemap)
-    print(f"   Saved to {sitemap_path}", file=sys.stderr)
+
+    # Build lookups shared by the page renderers and the sitemap
+    quoted_perms, quoted_role_paths, quoted_services = quote_names(dataset)
+    role_items = build_role_items(dataset['roles'], quoted_role_paths)
+    role_lists = build_role_lists(dataset['permissions'], role_items)
+    service_groups = group_by_service(dataset['permissions'])
+    role_ids = {role['name']: i for i, role in enumerate(dataset['roles'])}
+    services = [service for service, _ in service_groups]
+    worker_state = {
+        'role_lists': role_lists,
+        'quoted_perms': quoted_perms,
+        'quoted_role_paths': quoted_role_paths,
+    }
+
+    old_manifest = {} if args.archive or args.full else load_manifest(PAGES_MANIFEST)
+    # Archive members are stamped with the dataset's timestamp rather than the
+    # wall clock, and pages are added in dataset order, so rebuilding from the
+    # same data produces a byte-identical archive.
+    last_updated = datetime.strptime(dataset['metadata']['last_updated'], '%Y-%m-%dT%H:%M:%S.%fZ')
+    archive_mtime = int(last_updated.replace(tzinfo=timezone.utc).timestamp())
+    manifest = {}
+    written = 0
+
+    # The JSON files and sitemap only read the dataset, so they are written
+    # from background threads while the process pool renders pages. The pool
+    # is created first so its workers are forked before any threads start.
+    archive = open_archive(PAGES_ARCHIVE, archive_mtime) if args.archive else contextlib.nullcontext()
+    with archive as tar, \
+            multiprocessing.Pool(os.cpu_count(), initializer=_init_worker, initargs=(worker_state,)) as pool, \
+            ThreadPoolExecutor(max_workers=2) as writers:
+        # Loose files can land in any order; archive members must not
+        imap = pool.imap if tar else pool.imap_unordered
+        print("\n4. Saving JSON data and sitemap.xml in the background...", file=sys.stderr)
+        json_future = writers.submit(save_json_data, dataset, json_path, compact_path)
+        sitemap_future = writers.submit(write_sitemap, sitemap_path, dataset, services,
+                                        quoted_perms, quoted_role_paths, quoted_services)
+
+        # Generate static pages
+        print("\n5. Generating static HTML pages...", file=sys.stderr)
+
+        # Permission pages
+        print("   Generating permission pages...", file=sys.stderr)
+        pages = imap(_render_perm, dataset['permissions'], chunksize=128)
+        for i, (filename, html) in enumerate(pages):
+            if tar:
+                add_to_archive(tar, f'permissions/{filename}', html, archive_mtime)
+            else:
+                key = f'permissions/{filename}'
+                written += write_if_changed(PERMISSIONS_DIR / filename, html, key, old_manifest, manifest)
+            if (i + 1) % 1000 == 0:
+                print(f"      {i + 1}/{len(dataset['permissions'])} permissions", file=sys.stderr)
+        print(f"   Generated {len(dataset['permissions'])} permission pages", file=sys.stderr)
+
+        # Role pages
+        print("   Generating role pages...", file=sys.stderr)
+        pages = imap(_render_role, dataset['roles'], chunksize=32)
+        for i, (filename, html) in enumerate(pages):
+            if tar:
+                add_to_archive(tar, f'roles/{filename}', html, archive_mtime)
+            else:
+                key = f'roles/{filename}'
+                written += write_if_changed(ROLES_DIR / filename, html, key, old_manifest, manifest)
+            if (i + 1) % 500 == 0:
+                print(f"      {i + 1}/{len(dataset['roles'])} roles", file=sys.stderr)
+        print(f"   Generated {len(dataset['roles'])} role pages", file=sys.stderr)
+
+        # Service pages, each with a JSON chunk of its permissions for on-demand loading
+        print("   Generating service pages...", file=sys.stderr)
+        for service, perms in service_groups:
+            filename = service.replace('/', '_')
+            outputs = (
+                (f'{filename}.html', generate_service_page(service, perms, quoted_perms, quoted_services)),
+                (f'{filename}.json', dump_json(build_service_chunk(perms, role_ids), indent=False)),
+            )
+            for name, data in outputs:
+                if tar:
+                    add_to_archive(tar, f'services/{name}', data, archive_mtime)
+                else:
+                    written += write_if_changed(SERVICES_DIR / name, data, f'services/{name}', old_manifest, manifest)
+        print(f"   Generated {len(service_groups)} service pages", file=sys.stderr)
+
+        if not args.archive:
+            save_manifest(PAGES_MANIFEST, manifest)
+            print(f"   Wrote {written} changed files ({len(manifest) - written} unchanged)", file=sys.stderr)
+
+        # Wait for the background writes, re-raising any error
+        print("\n6. Finishing JSON data and sitemap.xml...", file=sys.stderr)
+        json_future.result()
+        print(f"   Saved to {json_path}", file=sys.stderr)
+        print(f"   Saved to {compact_path}", file=sys.stderr)
+        sitemap_future.result()
+        print(f"   Saved to {sitemap_path}", file=sys.stderr)
 
     # Generate index
     print("\n7. Generating index.html...", file=sys.stderr)
-    index_html = generate_index_page(dataset['metadata'])
+    index_html = generate_index_page(dataset['metadata'], service_groups, quoted_services)
     index_path = STATIC_DIR / "index.html"
     with open(index_path, 'w') as f:
         f.write(index_html)
@@ -463,8 +889,14 @@ def main():
     print("Done!", file=sys.stderr)
     print(f"\nGenerated files:", file=sys.stderr)
     print(f"  - {json_path}", file=sys.stderr)
-    print(f"  - {len(dataset['permissions'])} permission pages in {PERMISSIONS_DIR}", file=sys.stderr)
-    print(f"  - {len(dataset['roles'])} role pages in {ROLES_DIR}", file=sys.stderr)
+    print(f"  - {compact_path}", file=sys.stderr)
+    if args.archive:
+        print(f"  - {len(dataset['permissions'])} permission, {len(dataset['roles'])} role and "
+              f"{len(service_groups)} service pages in {PAGES_ARCHIVE}", file=sys.stderr)
+    else:
+        print(f"  - {len(dataset['permissions'])} permission pages in {PERMISSIONS_DIR}", file=sys.stderr)
+        print(f"  - {len(dataset['roles'])} role pages in {ROLES_DIR}", file=sys.stderr)
+        print(f"  - {len(service_groups)} service pages and JSON chunks in {SERVICES_DIR}", file=sys.stderr)
     print(f"  - {sitemap_path}", file=sys.stderr)
     print(f"  - {index_path}", file=sys.stderr)
 